@@ -29,7 +29,7 @@ especificacoes = {
     'BBSEGURIDADE': 'bbse',
     'BTG PACTUAL': 'bpac',
     'CVC': 'cvcb',
-    'COPASA': 'CSMG3',
+    'COPASA': 'csmg',
     'CPFL': 'cpfe',
     'CCR': 'ccro',
     'SID NACIONAL': 'csna',
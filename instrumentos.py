@@ -0,0 +1,339 @@
+import argparse
+import csv
+import mmap
+import os
+import re
+import struct
+import unicodedata
+
+from typing import Dict, List, Sequence, Tuple
+
+# Tabela de instrumentos da B3 compilada a partir do dump CSV de cadastro de instrumentos
+# (InstrumentsConsolidatedFile). O arquivo compilado é mapeado em memória e só é aberto
+# na primeira consulta, de modo que o tempo de inicialização não cresce com o tamanho da tabela.
+
+PASTA_INSTRUMENTOS = "instrumentos/"
+ARQUIVO_INSTRUMENTOS = PASTA_INSTRUMENTOS+"instrumentos.bin"
+
+FORMATO_MAGICO = b"B3INSTR\x00"
+FORMATO_VERSAO = 2
+
+# Cabeçalho: mágico, versão, reservado, nº de nomes, nº de raízes, nº de tickers, tamanho do bloco de textos
+CABECALHO = struct.Struct("<8sHHIIII")
+# Índice de nomes normalizados, ordenado pelo nome: offset e tamanho do nome no bloco de textos, índice da raiz
+REGISTRO_NOME = struct.Struct("<III")
+# Raízes de ticker ordenadas: offset e tamanho, no bloco de textos, dos sufixos à vista separados por vírgula
+REGISTRO_RAIZ = struct.Struct("<4sII")
+# Tickers completos ordenados (inclui séries de opções e futuros)
+REGISTRO_TICKER = struct.Struct("<12s")
+
+COLUNA_TICKER = "TckrSymb"
+# O dump não traz o nome de pregão impresso nas notas, apenas a razão social e a descrição do ativo
+COLUNAS_NOME = ("CrpnNm", "AsstDesc")
+# Colunas que identificam o mercado à vista, quando presentes no dump
+COLUNAS_MERCADO = {"SgmtNm": "CASH", "MktNm": "EQUITY-CASH"}
+# Categorias do mercado à vista que não são classes de ações/cotas (direitos, recibos, debêntures)
+COLUNA_CATEGORIA = "SctyCtgyNm"
+CATEGORIAS_IGNORADAS = ("RIGHTS", "RECEIPTS", "DEBENTURES", "WARRANTS")
+
+# Classes que aparecem na especificação do título logo após o nome ou a raiz
+CLASSES_ESPECIFICACAO = ("ON", "PN", "PNA", "PNB", "UNT", "CI")
+
+SUFIXOS_SOCIETARIOS = (("S", "A"), ("SA",), ("LTDA",))
+
+REGEX_TICKER = re.compile(r'^([A-Z][A-Z0-9]{3})([A-Z0-9]{1,8})$')
+
+
+# Normaliza um nome: remove acentos, coloca em maiúsculas e troca pontuação por espaço
+def normalizar_nome(nome: str) -> str:
+    nome = unicodedata.normalize("NFKD", nome)
+    nome = "".join(c for c in nome if not unicodedata.combining(c))
+    return " ".join(re.sub(r'[^A-Z0-9]+', ' ', nome.upper()).split())
+
+# Separa um ticker em raiz (4 caracteres) e sufixo. Ex.: PETR4 -> (PETR, 4), PETRA123 -> (PETR, A123)
+def separar_ticker(ticker: str) -> Tuple[str, str] | None:
+    grupos = REGEX_TICKER.match(ticker.strip().upper())
+    if grupos is None:
+        return None
+    return grupos.group(1), grupos.group(2)
+
+# Gera as chaves de índice de um nome: o nome normalizado e, se houver, a versão sem "S.A."/"LTDA" no final
+def chaves_do_nome(nome: str) -> List[str]:
+    tokens = normalizar_nome(nome).split()
+    if not tokens:
+        return []
+    chaves = [" ".join(tokens)]
+    removido = True
+    while removido:
+        removido = False
+        for sufixo in SUFIXOS_SOCIETARIOS:
+            if len(tokens) > len(sufixo) and tuple(tokens[-len(sufixo):]) == sufixo:
+                tokens = tokens[:-len(sufixo)]
+                removido = True
+    if " ".join(tokens) != chaves[0]:
+        chaves.append(" ".join(tokens))
+    return chaves
+
+
+# Lê o dump CSV da B3 e compila o arquivo binário de consulta
+def compilar_instrumentos(csv_path: str, saida_path: str = ARQUIVO_INSTRUMENTOS, encoding: str = "latin-1", colunas_nome: Sequence[str] = COLUNAS_NOME) -> Tuple[int, int, int]:
+    nomes: Dict[str, Tuple[bool, str]] = {}  # nome -> (vem de ticker à vista, raiz)
+    raizes: Dict[str, set] = {}
+    tickers: set = set()
+
+    with open(csv_path, 'r', encoding=encoding, newline='') as in_file:
+        # O dump pode trazer linhas de status antes do cabeçalho
+        linha = in_file.readline()
+        while linha and COLUNA_TICKER not in linha.rstrip('\r\n').split(';'):
+            linha = in_file.readline()
+        if not linha:
+            raise Exception("Coluna " + COLUNA_TICKER + " não encontrada no arquivo de instrumentos")
+        cabecalho = next(csv.reader([linha], delimiter=';'))
+        colunas_nome_presentes = [coluna for coluna in colunas_nome if coluna in cabecalho]
+        colunas_mercado = {coluna: valor for coluna, valor in COLUNAS_MERCADO.items() if coluna in cabecalho}
+
+        for registro in csv.DictReader(in_file, fieldnames=cabecalho, delimiter=';'):
+            ticker = (registro.get(COLUNA_TICKER) or "").strip().upper()
+            separado = separar_ticker(ticker)
+            if separado is None or len(ticker) > REGISTRO_TICKER.size:
+                continue
+            raiz, sufixo = separado
+
+            # Classe à vista: sufixo numérico no mercado à vista, quando o dump informa o mercado
+            a_vista = sufixo.isdigit()
+            for coluna, valor in colunas_mercado.items():
+                if (registro.get(coluna) or "").strip().upper() != valor:
+                    a_vista = False
+            if (registro.get(COLUNA_CATEGORIA) or "").strip().upper() in CATEGORIAS_IGNORADAS:
+                a_vista = False
+
+            tickers.add(ticker)
+            sufixos = raizes.setdefault(raiz, set())
+            if a_vista:
+                sufixos.add(sufixo)
+
+            # Um nome aponta para a raiz de um ticker à vista, se existir, senão para a primeira encontrada
+            for coluna in colunas_nome_presentes:
+                for chave in chaves_do_nome(registro.get(coluna) or ""):
+                    atual = nomes.get(chave)
+                    if atual is None or (a_vista and not atual[0]):
+                        nomes[chave] = (a_vista, raiz)
+
+    raizes_ordenadas = sorted(raizes)
+    indice_raiz = {raiz: index for index, raiz in enumerate(raizes_ordenadas)}
+
+    textos = bytearray()
+    bloco_nomes = bytearray()
+    for chave in sorted(nomes, key=lambda nome: nome.encode('ascii')):
+        chave_bytes = chave.encode('ascii')
+        bloco_nomes += REGISTRO_NOME.pack(len(textos), len(chave_bytes), indice_raiz[nomes[chave][1]])
+        textos += chave_bytes
+
+    bloco_raizes = bytearray()
+    for raiz in raizes_ordenadas:
+        sufixos = ",".join(sorted(raizes[raiz], key=lambda sufixo: (len(sufixo), sufixo))).encode('ascii')
+        bloco_raizes += REGISTRO_RAIZ.pack(raiz.encode('ascii'), len(textos), len(sufixos))
+        textos += sufixos
+
+    bloco_tickers = b"".join(REGISTRO_TICKER.pack(ticker.encode('ascii')) for ticker in sorted(tickers))
+
+    pasta_saida = os.path.dirname(saida_path)
+    if pasta_saida and not os.path.exists(pasta_saida):
+        os.makedirs(pasta_saida)
+
+    # Escreve num arquivo temporário e troca no final, para não deixar um arquivo pela metade
+    temp_path = saida_path + ".tmp"
+    with open(temp_path, 'wb') as out_file:
+        out_file.write(CABECALHO.pack(FORMATO_MAGICO, FORMATO_VERSAO, 0, len(nomes), len(raizes_ordenadas), len(tickers), len(textos)))
+        out_file.write(bloco_nomes)
+        out_file.write(bloco_raizes)
+        out_file.write(bloco_tickers)
+        out_file.write(textos)
+    os.replace(temp_path, saida_path)
+
+    return len(nomes), len(raizes_ordenadas), len(tickers)
+
+
+class TabelaInstrumentos:
+    def __init__(self, path: str):
+        # Um arquivo vazio ou menor que o cabeçalho não pode ser mapeado
+        if os.path.getsize(path) < CABECALHO.size:
+            raise Exception("Arquivo de instrumentos inválido: " + path)
+        with open(path, 'rb') as in_file:
+            self.dados = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, versao, _, self.n_nomes, self.n_raizes, self.n_tickers, tamanho_textos = CABECALHO.unpack_from(self.dados, 0)
+        if magico != FORMATO_MAGICO:
+            raise Exception("Arquivo de instrumentos inválido: " + path)
+        if versao != FORMATO_VERSAO:
+            raise Exception("Versão do arquivo de instrumentos incompatível (" + str(versao) + "), compile novamente com instrumentos.py")
+
+        self.inicio_nomes = CABECALHO.size
+        self.inicio_raizes = self.inicio_nomes + self.n_nomes*REGISTRO_NOME.size
+        self.inicio_tickers = self.inicio_raizes + self.n_raizes*REGISTRO_RAIZ.size
+        self.inicio_textos = self.inicio_tickers + self.n_tickers*REGISTRO_TICKER.size
+
+        # Arquivo truncado: as contagens do cabeçalho não batem com o tamanho do arquivo
+        if self.inicio_textos + tamanho_textos != len(self.dados):
+            raise Exception("Arquivo de instrumentos inválido: " + path)
+
+    def texto(self, offset: int, tamanho: int) -> bytes:
+        inicio = self.inicio_textos + offset
+        return self.dados[inicio:inicio + tamanho]
+
+    def nome(self, index: int) -> Tuple[bytes, int]:
+        offset, tamanho, index_raiz = REGISTRO_NOME.unpack_from(self.dados, self.inicio_nomes + index*REGISTRO_NOME.size)
+        return self.texto(offset, tamanho), index_raiz
+
+    def raiz(self, index: int) -> Tuple[str, List[str]]:
+        raiz, offset, tamanho = REGISTRO_RAIZ.unpack_from(self.dados, self.inicio_raizes + index*REGISTRO_RAIZ.size)
+        sufixos = self.texto(offset, tamanho).decode('ascii')
+        return raiz.decode('ascii'), sufixos.split(",") if sufixos else []
+
+    def ticker(self, index: int) -> bytes:
+        return REGISTRO_TICKER.unpack_from(self.dados, self.inicio_tickers + index*REGISTRO_TICKER.size)[0].rstrip(b"\x00")
+
+    # Primeiro índice cujo nome é >= chave (busca binária no índice ordenado)
+    def primeiro_nome(self, chave: bytes) -> int:
+        inicio, fim = 0, self.n_nomes
+        while inicio < fim:
+            meio = (inicio + fim)//2
+            if self.nome(meio)[0] < chave:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return inicio
+
+    def buscar_nome(self, chave: str) -> int | None:
+        chave_bytes = chave.encode('ascii')
+        index = self.primeiro_nome(chave_bytes)
+        if index < self.n_nomes:
+            nome, index_raiz = self.nome(index)
+            if nome == chave_bytes:
+                return index_raiz
+        return None
+
+    # Raiz única dos nomes que começam com a chave seguida de espaço, ou None se não houver ou for ambígua
+    def buscar_prefixo(self, chave: str) -> int | None:
+        prefixo = (chave + " ").encode('ascii')
+        index = self.primeiro_nome(prefixo)
+        encontrada = None
+        while index < self.n_nomes:
+            nome, index_raiz = self.nome(index)
+            if not nome.startswith(prefixo):
+                break
+            if encontrada is not None and encontrada != index_raiz:
+                return None
+            encontrada = index_raiz
+            index += 1
+        return encontrada
+
+    def buscar_ticker(self, ticker: str) -> bool:
+        ticker_bytes = ticker.encode('ascii')
+        inicio, fim = 0, self.n_tickers
+        while inicio < fim:
+            meio = (inicio + fim)//2
+            atual = self.ticker(meio)
+            if atual == ticker_bytes:
+                return True
+            if atual < ticker_bytes:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return False
+
+    def buscar_raiz(self, raiz: str) -> int | None:
+        raiz_bytes = raiz.encode('ascii')
+        inicio, fim = 0, self.n_raizes
+        while inicio < fim:
+            meio = (inicio + fim)//2
+            atual = REGISTRO_RAIZ.unpack_from(self.dados, self.inicio_raizes + meio*REGISTRO_RAIZ.size)[0]
+            if atual == raiz_bytes:
+                return meio
+            if atual < raiz_bytes:
+                inicio = meio + 1
+            else:
+                fim = meio
+        return None
+
+
+_tabela: TabelaInstrumentos | None = None
+_tabela_carregada = False
+
+# Abre a tabela compilada na primeira chamada. Retorna None se o arquivo ainda não foi compilado
+def carregar_tabela() -> TabelaInstrumentos | None:
+    global _tabela, _tabela_carregada
+    if not _tabela_carregada:
+        if os.path.exists(ARQUIVO_INSTRUMENTOS):
+            _tabela = TabelaInstrumentos(ARQUIVO_INSTRUMENTOS)
+        _tabela_carregada = True
+    return _tabela
+
+# Procura na especificação um ticker completo listado na tabela (ex.: série de opção). Retorna o ticker ou None
+def buscar_ticker_citado(especificacao: str) -> str | None:
+    tabela = carregar_tabela()
+    if tabela is None:
+        return None
+
+    for token in normalizar_nome(especificacao).split():
+        if separar_ticker(token) is not None and tabela.buscar_ticker(token):
+            return token
+    return None
+
+# Procura o emissor da especificação na tabela de instrumentos, do critério mais estrito para o mais solto:
+# nome exato, raiz de ticker com classes à vista seguida de uma classe (ex.: "CSMG ON") e, por último, início único de um nome
+# com pelo menos duas palavras, para que uma palavra genérica ("BRASIL", "AES") não leve a outro emissor.
+# Retorna (raiz, sufixos à vista da raiz), ou None se a tabela não foi compilada ou nada foi encontrado
+def buscar_por_especificacao(especificacao: str) -> Tuple[str, List[str]] | None:
+    tabela = carregar_tabela()
+    if tabela is None:
+        return None
+
+    tokens = normalizar_nome(especificacao).split()
+
+    for tamanho in range(len(tokens), 0, -1):
+        index_raiz = tabela.buscar_nome(" ".join(tokens[:tamanho]))
+        if index_raiz is not None:
+            return tabela.raiz(index_raiz)
+
+    for token, proximo in zip(tokens, tokens[1:]):
+        if len(token) == 4 and proximo in CLASSES_ESPECIFICACAO:
+            index_raiz = tabela.buscar_raiz(token)
+            if index_raiz is not None and tabela.raiz(index_raiz)[1]:
+                return tabela.raiz(index_raiz)
+
+    for tamanho in range(len(tokens), 1, -1):
+        index_raiz = tabela.buscar_prefixo(" ".join(tokens[:tamanho]))
+        if index_raiz is not None:
+            return tabela.raiz(index_raiz)
+
+    return None
+
+# Monta o ticker de uma raiz encontrada na tabela. A classe indicada pela especificação precisa estar entre
+# as classes à vista da raiz; só quando a especificação não indica classe é que a única classe da raiz é usada.
+# Retorna None quando o ticker resultante não existe na tabela
+def resolver_ticker(raiz: str, aditivo: str | None, sufixos: List[str]) -> str | None:
+    tabela = carregar_tabela()
+    if tabela is None:
+        return None
+
+    if aditivo is None and len(sufixos) == 1:
+        aditivo = sufixos[0]
+    if aditivo is None or (sufixos and aditivo not in sufixos):
+        return None
+
+    ticker = raiz.upper() + aditivo
+    if not tabela.buscar_ticker(ticker):
+        return None
+    return ticker
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compila o dump CSV de instrumentos da B3 na tabela de consulta de tickers")
+    parser.add_argument("csv_path", help="Arquivo CSV de cadastro de instrumentos da B3")
+    parser.add_argument("--saida", default=ARQUIVO_INSTRUMENTOS, help="Arquivo compilado (padrão: " + ARQUIVO_INSTRUMENTOS + ")")
+    parser.add_argument("--encoding", default="latin-1", help="Codificação do CSV (padrão: latin-1)")
+    parser.add_argument("--coluna-nome", action="append", dest="colunas_nome", help="Coluna com nomes a indexar, pode ser repetida (padrão: " + ", ".join(COLUNAS_NOME) + ")")
+    args = parser.parse_args()
+
+    n_nomes, n_raizes, n_tickers = compilar_instrumentos(args.csv_path, args.saida, args.encoding, args.colunas_nome or COLUNAS_NOME)
+    print("Tabela compilada em " + args.saida + ": " + str(n_nomes) + " nomes, " + str(n_raizes) + " raízes, " + str(n_tickers) + " tickers")
@@ -16,7 +16,7 @@ from pdfminer.pdfparser import PDFParser
 from typing import List, Tuple
 from pydantic import BaseModel
 
-from especificacoes import especificacoes
+from tickers import find_ticker_by_especificacao
 
 PASTA_NOTAS = "notas/"
 PASTA_NAO_PROCESSADOS = PASTA_NOTAS+"nao_processados/"
@@ -124,47 +124,6 @@ def get_nota_number_inside_nota_list(nota_number: str, nota_list: List[NotaCompi
             return index
     return None
 
-def find_ticker_by_especificacao(especificacao: str):
-    ticker = ""
-    for especificacao_key, especificacao_value in especificacoes.items():
-        if re.search(especificacao_key, especificacao, re.IGNORECASE):
-            ticker = especificacao_value
-            break
-
-    if ticker == "":
-        for especificacao_key, especificacao_value in especificacoes.items():
-            if re.search(especificacao_value, especificacao, re.IGNORECASE):
-                ticker = especificacao_value
-                break
-
-    if ticker == "":
-        raise Exception("Ticker não encontrado")
-    
-    aditivo = None
-    if re.search("ON", especificacao, re.IGNORECASE):
-        aditivo = "3"
-    elif re.search("PNA", especificacao, re.IGNORECASE):
-        aditivo = "5"
-    elif re.search("PNB", especificacao, re.IGNORECASE):
-        aditivo = "6"
-    elif re.search("PN", especificacao, re.IGNORECASE):
-        aditivo = "4"
-    elif re.search("UNT", especificacao, re.IGNORECASE):
-        aditivo = "11"
-    elif re.search("CI", especificacao, re.IGNORECASE):
-        aditivo = "11"
-    elif re.search("FII ", especificacao, re.IGNORECASE):
-        aditivo = "11"
-    elif re.search("F11", especificacao, re.IGNORECASE):
-        aditivo = "11"
-    elif re.search("DO", especificacao, re.IGNORECASE):
-        aditivo = "1"
-    else:
-        raise Exception("Aditivo não encontrado")
-    
-    ticker = ticker + aditivo
-    return ticker.upper()
-    
 # From a list of NotaCompilada, create a dataframe with all operations and return it
 def get_dataframe_from_list_notacompilada(nota_list: List[NotaCompilada]) -> pd.DataFrame:
     data = []
@@ -0,0 +1,110 @@
+import os
+import struct
+import tempfile
+import unittest
+
+import instrumentos
+
+DUMP = """Status do Arquivo: Final
+RptDt;TckrSymb;Asst;SgmtNm;MktNm;SctyCtgyNm;CrpnNm
+2024-01-02;BBAS3;BBAS;CASH;EQUITY-CASH;SHARES;BANCO DO BRASIL S.A.
+2024-01-02;BBRK3;BBRK;CASH;EQUITY-CASH;SHARES;BRASIL BROKERS PARTICIPACOES S.A.
+2024-01-02;PETR3;PETR;CASH;EQUITY-CASH;SHARES;PETROBRAS
+2024-01-02;PETR4;PETR;CASH;EQUITY-CASH;SHARES;PETROBRAS
+2024-01-02;PETRA123;PETR;EQUITY DERIVATIVES;OPTIONS ON EQUITIES;OPTION ON EQUITY;
+2024-01-02;VBBR3;VBBR;CASH;EQUITY-CASH;SHARES;PETROBRAS DISTRIBUIDORA S.A.
+2024-01-02;CSMG3;CSMG;CASH;EQUITY-CASH;SHARES;CIA SANEAMENTO DE MINAS GERAIS COPASA MG
+2024-01-02;CSMG1;CSMG;CASH;EQUITY-CASH;RIGHTS;CIA SANEAMENTO DE MINAS GERAIS COPASA MG
+2024-01-02;DOLF27;DOL;BMF;FUTURE;FUTURES;
+2024-01-02;ITUB3;ITUB;CASH;EQUITY-CASH;SHARES;ITAU UNIBANCO HOLDING S.A.
+2024-01-02;ITUB4;ITUB;CASH;EQUITY-CASH;SHARES;ITAU UNIBANCO HOLDING S.A.
+2024-01-02;ITSA4;ITSA;CASH;EQUITY-CASH;SHARES;ITAU INVESTIMENTOS S.A.
+2024-01-02;GOAU4;GOAU;CASH;EQUITY-CASH;SHARES;METALURGICA GERDAU S.A.
+2024-01-02;AESB3;AESB;CASH;EQUITY-CASH;SHARES;AES BRASIL ENERGIA S.A.
+"""
+
+
+# Compila DUMP numa pasta temporária e aponta a tabela de instrumentos para ela
+class TabelaTemporaria(unittest.TestCase):
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        csv_path = os.path.join(self.pasta.name, "instrumentos.csv")
+        with open(csv_path, 'w', encoding='latin-1') as out_file:
+            out_file.write(DUMP)
+
+        self.arquivo_original = instrumentos.ARQUIVO_INSTRUMENTOS
+        instrumentos.ARQUIVO_INSTRUMENTOS = os.path.join(self.pasta.name, "instrumentos.bin")
+        instrumentos._tabela = None
+        instrumentos._tabela_carregada = False
+        instrumentos.compilar_instrumentos(csv_path, instrumentos.ARQUIVO_INSTRUMENTOS)
+
+    def tearDown(self):
+        if instrumentos._tabela is not None:
+            instrumentos._tabela.dados.close()
+        instrumentos._tabela = None
+        instrumentos._tabela_carregada = False
+        instrumentos.ARQUIVO_INSTRUMENTOS = self.arquivo_original
+        self.pasta.cleanup()
+
+
+class TestInstrumentos(TabelaTemporaria):
+    def test_nome_exato(self):
+        self.assertEqual(instrumentos.buscar_por_especificacao("PETROBRAS PN N2"), ("PETR", ["3", "4"]))
+        self.assertEqual(instrumentos.buscar_por_especificacao("BANCO DO BRASIL ON NM"), ("BBAS", ["3"]))
+
+    def test_prefixo(self):
+        self.assertEqual(instrumentos.buscar_por_especificacao("CIA SANEAMENTO ON"), ("CSMG", ["3"]))
+        # "ITAU" inicia ITAU UNIBANCO HOLDING e ITAU INVESTIMENTOS, de raízes diferentes
+        self.assertIsNone(instrumentos.buscar_por_especificacao("ITAU UNIBANC XYZ"))
+        self.assertIsNone(instrumentos.buscar_por_especificacao("ITAU XYZ"))
+        # Uma única palavra em comum não basta para identificar o emissor
+        self.assertIsNone(instrumentos.buscar_por_especificacao("AES TIETE UNT"))
+        self.assertIsNone(instrumentos.buscar_por_especificacao("METALURGICA XYZ ON"))
+
+    def test_raiz_citada(self):
+        # A raiz só é aceita seguida de uma classe
+        self.assertEqual(instrumentos.buscar_por_especificacao("CSMG ON"), ("CSMG", ["3"]))
+        self.assertIsNone(instrumentos.buscar_por_especificacao("XPTO CSMG"))
+
+    def test_ticker_citado(self):
+        self.assertEqual(instrumentos.buscar_ticker_citado("PETROBRAS DISTRIBUIDORA PETR4"), "PETR4")
+        self.assertEqual(instrumentos.buscar_ticker_citado("OPCAO PETRA123"), "PETRA123")
+        self.assertIsNone(instrumentos.buscar_ticker_citado("PETROBRAS PN N2"))
+
+    def test_sufixos_a_vista(self):
+        # Direitos e futuros não entram como classes à vista
+        self.assertEqual(instrumentos.buscar_por_especificacao("CSMG ON")[1], ["3"])
+        self.assertEqual(instrumentos.buscar_ticker_citado("DOLF27"), "DOLF27")
+        self.assertIsNone(instrumentos.buscar_por_especificacao("DOLF ON"))
+
+    def test_resolver_ticker(self):
+        self.assertEqual(instrumentos.resolver_ticker("PETR", "4", ["3", "4"]), "PETR4")
+        # Sem classe na especificação, usa a única classe da raiz
+        self.assertEqual(instrumentos.resolver_ticker("BBRK", None, ["3"]), "BBRK3")
+        # Classe indicada e não listada não é trocada por outra
+        self.assertIsNone(instrumentos.resolver_ticker("VBBR", "4", ["3"]))
+        self.assertIsNone(instrumentos.resolver_ticker("PETR", "5", ["3", "4"]))
+        self.assertIsNone(instrumentos.resolver_ticker("PETR", None, ["3", "4"]))
+        self.assertIsNone(instrumentos.resolver_ticker("DOLF", "3", []))
+
+    def test_versao_incompativel(self):
+        with open(instrumentos.ARQUIVO_INSTRUMENTOS, 'r+b') as arquivo:
+            arquivo.seek(8)
+            arquivo.write(struct.pack("<H", instrumentos.FORMATO_VERSAO + 1))
+        with self.assertRaisesRegex(Exception, "Versão do arquivo de instrumentos incompatível"):
+            instrumentos.carregar_tabela()
+
+    def test_arquivo_truncado(self):
+        with open(instrumentos.ARQUIVO_INSTRUMENTOS, 'r+b') as arquivo:
+            arquivo.truncate(os.path.getsize(instrumentos.ARQUIVO_INSTRUMENTOS) - 1)
+        with self.assertRaisesRegex(Exception, "Arquivo de instrumentos inválido"):
+            instrumentos.carregar_tabela()
+
+    def test_arquivo_vazio(self):
+        open(instrumentos.ARQUIVO_INSTRUMENTOS, 'wb').close()
+        with self.assertRaisesRegex(Exception, "Arquivo de instrumentos inválido"):
+            instrumentos.carregar_tabela()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import os
+import unittest
+
+import instrumentos
+from test_instrumentos import TabelaTemporaria
+from tickers import find_ticker_by_especificacao
+
+
+class TestFindTickerComTabela(TabelaTemporaria):
+    def test_dicionario_antes_da_tabela(self):
+        # A tabela levaria "BRASIL" a BRASIL BROKERS e "PETROBRAS" seria ambíguo com PETROBRAS DISTRIBUIDORA
+        self.assertEqual(find_ticker_by_especificacao("BRASIL ON NM"), "BBAS3")
+        self.assertEqual(find_ticker_by_especificacao("PETROBRAS PN N2"), "PETR4")
+
+    def test_copasa(self):
+        self.assertEqual(find_ticker_by_especificacao("COPASA ON NM"), "CSMG3")
+
+    def test_ticker_citado(self):
+        self.assertEqual(find_ticker_by_especificacao("OPCAO PETRA123"), "PETRA123")
+
+    def test_nome_da_tabela(self):
+        self.assertEqual(find_ticker_by_especificacao("ITAU INVESTIMENTOS PN"), "ITSA4")
+
+    def test_ticker_nao_listado(self):
+        # BRASIL BROKERS só tem a classe 3 listada
+        with self.assertRaisesRegex(Exception, "Ticker não encontrado"):
+            find_ticker_by_especificacao("BRASIL BROKERS PARTICIPACOES PN")
+        with self.assertRaisesRegex(Exception, "Ticker não encontrado"):
+            find_ticker_by_especificacao("AES TIETE UNT")
+        with self.assertRaisesRegex(Exception, "Ticker não encontrado"):
+            find_ticker_by_especificacao("METALURGICA XYZ ON")
+
+
+class TestFindTickerSemTabela(unittest.TestCase):
+    def setUp(self):
+        self.arquivo_original = instrumentos.ARQUIVO_INSTRUMENTOS
+        instrumentos.ARQUIVO_INSTRUMENTOS = os.path.join("instrumentos", "inexistente.bin")
+        instrumentos._tabela = None
+        instrumentos._tabela_carregada = False
+
+    def tearDown(self):
+        instrumentos._tabela = None
+        instrumentos._tabela_carregada = False
+        instrumentos.ARQUIVO_INSTRUMENTOS = self.arquivo_original
+
+    # Mesmo resultado de antes da tabela de instrumentos, exceto COPASA (antes CSMG33)
+    def test_mesmo_resultado_sem_tabela(self):
+        self.assertEqual(find_ticker_by_especificacao("PETROBRAS PN N2"), "PETR4")
+        self.assertEqual(find_ticker_by_especificacao("BRASIL ON NM"), "BBAS3")
+        self.assertEqual(find_ticker_by_especificacao("ITAUUNIBANCO PN N1"), "ITUB4")
+        self.assertEqual(find_ticker_by_especificacao("VALE ON NM"), "VALE3")
+        self.assertEqual(find_ticker_by_especificacao("MAXI RENDA FII CI"), "MXRF11")
+        self.assertEqual(find_ticker_by_especificacao("COPASA ON NM"), "CSMG3")
+        with self.assertRaisesRegex(Exception, "Ticker não encontrado"):
+            find_ticker_by_especificacao("XYZ QWERTY ON")
+        with self.assertRaisesRegex(Exception, "Aditivo não encontrado"):
+            find_ticker_by_especificacao("VALE")
+        with self.assertRaisesRegex(Exception, "Aditivo não encontrado"):
+            find_ticker_by_especificacao("OPCAO PETRA123")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import re
+
+from especificacoes import especificacoes
+import instrumentos
+
+# Encontra o ticker do ativo a vista a partir da especificação do título na nota
+def find_ticker_by_especificacao(especificacao: str):
+    # Ticker completo citado na especificação e listado na tabela de instrumentos da B3 (instrumentos.py)
+    ticker_citado = instrumentos.buscar_ticker_citado(especificacao)
+    if ticker_citado is not None:
+        return ticker_citado
+
+    ticker = ""
+    for especificacao_key, especificacao_value in especificacoes.items():
+        if re.search(especificacao_key, especificacao, re.IGNORECASE):
+            ticker = especificacao_value
+            break
+
+    if ticker == "":
+        for especificacao_key, especificacao_value in especificacoes.items():
+            if re.search(especificacao_value, especificacao, re.IGNORECASE):
+                ticker = especificacao_value
+                break
+
+    # Fora do dicionário: emissor na tabela de instrumentos, se compilada
+    instrumento = None
+    if ticker == "":
+        instrumento = instrumentos.buscar_por_especificacao(especificacao)
+        if instrumento is not None:
+            ticker, sufixos = instrumento
+
+    if ticker == "":
+        raise Exception("Ticker não encontrado")
+    
+    aditivo = None
+    if re.search("ON", especificacao, re.IGNORECASE):
+        aditivo = "3"
+    elif re.search("PNA", especificacao, re.IGNORECASE):
+        aditivo = "5"
+    elif re.search("PNB", especificacao, re.IGNORECASE):
+        aditivo = "6"
+    elif re.search("PN", especificacao, re.IGNORECASE):
+        aditivo = "4"
+    elif re.search("UNT", especificacao, re.IGNORECASE):
+        aditivo = "11"
+    elif re.search("CI", especificacao, re.IGNORECASE):
+        aditivo = "11"
+    elif re.search("FII ", especificacao, re.IGNORECASE):
+        aditivo = "11"
+    elif re.search("F11", especificacao, re.IGNORECASE):
+        aditivo = "11"
+    elif re.search("DO", especificacao, re.IGNORECASE):
+        aditivo = "1"
+
+    # Raiz vinda da tabela: só aceita um ticker que exista nela
+    if instrumento is not None:
+        ticker_listado = instrumentos.resolver_ticker(ticker, aditivo, sufixos)
+        if ticker_listado is None:
+            raise Exception("Ticker não encontrado")
+        return ticker_listado
+
+    if aditivo is None:
+        raise Exception("Aditivo não encontrado")
+    
+    ticker = ticker + aditivo
+    return ticker.upper()